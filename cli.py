@@ -1,32 +1,49 @@
+import argparse
 import os
 import sys
-import re
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.completion import WordCompleter, PathCompleter
-from prompt_toolkit.lexers import PygmentsLexer
-from prompt_toolkit.styles import Style
-from pygments.lexers.shell import BashLexer
-from terminal.core import Terminal
-from terminal.commands import pwd, ls, cd, mkdir, rm, help_cmd
-from terminal.monitor import monitor_cmd
-from terminal.nl_parser import parse_natural_language, get_command_suggestions
-
-# Define styles for syntax highlighting
-style = Style.from_dict({
-    'command': '#00AA00 bold',  # Green for commands
-    'path': '#0000AA',          # Blue for paths
-    'option': '#AA00AA',        # Purple for options
-    'error': '#AA0000',         # Red for errors
-    'output': '#AAAAAA',        # Gray for output
-})
+import time
+from terminal.core import Terminal, parse_command
+from terminal.commands import pwd, ls, cd, pushd, popd, dirs, z, mkdir, rm, help_cmd, sha256sum, dedupe
+
+# Flush batch output after this many buffered results
+OUTPUT_BUFFER_LINES = 1000
+
+def monitor(terminal, *args):
+    """Display system monitoring information"""
+    # psutil is only imported once the command is actually used
+    from terminal.monitor import monitor_cmd
+    return monitor_cmd(terminal, *args)
+
+def create_terminal(dir_index_path=None, hash_index_path=None):
+    """Create a terminal with all CLI commands registered"""
+    terminal = Terminal(dir_index_path, hash_index_path)
+
+    # Register commands
+    terminal.register_command("pwd", pwd, "Print working directory")
+    terminal.register_command("ls", ls, "List directory contents")
+    terminal.register_command("cd", cd, "Change directory")
+    terminal.register_command("pushd", pushd, "Push a directory onto the stack and change to it")
+    terminal.register_command("popd", popd, "Pop a directory off the stack and change to it")
+    terminal.register_command("dirs", dirs, "Display the directory stack")
+    terminal.register_command("z", z, "Jump to a frequently used directory")
+    terminal.register_command("mkdir", mkdir, "Create a directory")
+    terminal.register_command("rm", rm, "Remove files or directories")
+    terminal.register_command("sha256sum", sha256sum, "Print SHA-256 checksums of files")
+    terminal.register_command("dedupe", dedupe, "Find duplicate files by content")
+    terminal.register_command("help", help_cmd, "Display help information")
+    terminal.register_command("monitor", monitor, "Display system monitoring information (--cluster host:port for all hosts)")
+    terminal.register_command("touch", lambda t, *args: open(os.path.join(t.current_dir, args[0]), 'a').close() or f"Created file: {args[0]}", "Create an empty file")
+    terminal.register_command("cat", lambda t, *args: open(os.path.join(t.current_dir, args[0]), 'r').read(), "Display file contents")
+    return terminal
 
 def get_completer(terminal):
     """Create a completer for the terminal commands and file paths"""
+    from prompt_toolkit.completion import WordCompleter, PathCompleter
+
     commands = list(terminal.commands.keys())
     command_completer = WordCompleter(commands, sentence=True)
     path_completer = PathCompleter()
-    
+
     def combined_completer(text, complete_event):
         # If we're at the start of the line, use command completer
         if not ' ' in text:
@@ -34,27 +51,89 @@ def get_completer(terminal):
         # Otherwise use path completer
         else:
             return path_completer.get_completions(text, complete_event)
-    
+
     return combined_completer
 
-def main():
-    # Create terminal instance
-    terminal = Terminal()
-    
-    # Register commands
-    terminal.register_command("pwd", pwd, "Print working directory")
-    terminal.register_command("ls", ls, "List directory contents")
-    terminal.register_command("cd", cd, "Change directory")
-    terminal.register_command("mkdir", mkdir, "Create a directory")
-    terminal.register_command("rm", rm, "Remove files or directories")
-    terminal.register_command("help", help_cmd, "Display help information")
-    terminal.register_command("monitor", monitor_cmd, "Display system monitoring information")
-    terminal.register_command("touch", lambda t, *args: open(os.path.join(t.current_dir, args[0]), 'a').close() or f"Created file: {args[0]}", "Create an empty file")
-    terminal.register_command("cat", lambda t, *args: open(os.path.join(t.current_dir, args[0]), 'r').read(), "Display file contents")
-    
+def run_lines(terminal, lines, exit_on_error=False, use_nl=False, out=None):
+    """Execute command lines back to back without a prompt.
+
+    Blank lines and lines starting with '#' are skipped and output is written
+    in buffered chunks. Returns a (commands run, commands failed) tuple.
+    """
+    out = out or sys.stdout
+    buffer = []
+    count = 0
+    errors = 0
+
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.lower() == "exit":
+            break
+
+        # Only fall back to natural language parsing when asked to
+        if use_nl:
+            from terminal.nl_parser import parse_natural_language
+            if not terminal.is_command(line):
+                line = parse_natural_language(terminal, line)
+
+        result = terminal.execute(line)
+        count += 1
+        if result:
+            buffer.append(result)
+        if terminal.last_status != 0:
+            errors += 1
+            if exit_on_error:
+                break
+        if len(buffer) >= OUTPUT_BUFFER_LINES:
+            out.write("\n".join(buffer) + "\n")
+            buffer = []
+
+    if buffer:
+        out.write("\n".join(buffer) + "\n")
+    out.flush()
+    return count, errors
+
+def run_batch(terminal, args):
+    """Run a -c command or a script file and report the total wall time"""
+    if args.command is not None:
+        lines = args.command.splitlines()
+    elif args.script == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(args.script, "r") as f:
+            lines = f.read().splitlines()
+
+    start = time.perf_counter()
+    count, errors = run_lines(terminal, lines, args.exit_on_error, args.nl)
+    elapsed = time.perf_counter() - start
+
+    if not args.quiet:
+        print(f"Ran {count} commands in {elapsed:.3f}s ({errors} failed)", file=sys.stderr)
+    return 1 if errors else 0
+
+def interactive(terminal):
+    """Run the interactive prompt with history, completion and highlighting"""
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import FileHistory
+    from prompt_toolkit.lexers import PygmentsLexer
+    from prompt_toolkit.styles import Style
+    from pygments.lexers.shell import BashLexer
+    from terminal.nl_parser import parse_natural_language, get_command_suggestions
+
+    # Define styles for syntax highlighting
+    style = Style.from_dict({
+        'command': '#00AA00 bold',  # Green for commands
+        'path': '#0000AA',          # Blue for paths
+        'option': '#AA00AA',        # Purple for options
+        'error': '#AA0000',         # Red for errors
+        'output': '#AAAAAA',        # Gray for output
+    })
+
     # Set up command completion for readline (for non-prompt_toolkit contexts)
     terminal.setup_autocomplete()
-    
+
     # Create prompt session with history and completion
     history_file = os.path.expanduser("~/.pyterminal_history")
     session = PromptSession(
@@ -63,53 +142,79 @@ def main():
         lexer=PygmentsLexer(BashLexer),
         style=style
     )
-    
+
     print("PyTerminal - A Python-based Terminal")
     print("Type 'help' for available commands or use natural language")
     print("Type 'exit' to quit")
     print("Use TAB for command and path auto-completion")
-    
+
     while True:
         try:
             # Get user input with auto-completion and syntax highlighting
             user_input = session.prompt(terminal.get_prompt())
-            
+
             # Check for exit command
             if user_input.strip().lower() == "exit":
                 break
-            
+
             # Parse natural language if it doesn't look like a command
-            if user_input and not user_input.split()[0] in terminal.commands:
+            if user_input.strip() and not terminal.is_command(user_input):
                 # Check for command suggestions first
                 suggestions = get_command_suggestions(user_input, terminal)
                 if len(suggestions) == 1:
                     # Single suggestion - use it
                     suggested_cmd = suggestions[0]
                     print(f"Did you mean: {suggested_cmd}?")
-                    user_input = suggested_cmd + (" " + " ".join(user_input.split()[1:]) if len(user_input.split()) > 1 else "")
+                    try:
+                        user_input = parse_command(user_input).with_name(suggested_cmd)
+                    except ValueError:
+                        user_input = " ".join([suggested_cmd] + user_input.split()[1:])
                 elif len(suggestions) > 1:
                     # Multiple suggestions
                     print(f"Did you mean one of these: {', '.join(suggestions)}?")
-                
+
                 # Try natural language parsing
                 parsed_cmd = parse_natural_language(terminal, user_input)
                 if parsed_cmd != user_input:
                     print(f"Interpreted as: {parsed_cmd}")
                     user_input = parsed_cmd
-            
+
             # Execute the command
             result = terminal.execute(user_input)
             if result:
                 print(result)
-                
+
         except KeyboardInterrupt:
             continue
         except EOFError:
             break
         except Exception as e:
             print(f"Error: {str(e)}")
-    
+
     print("Goodbye!")
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PyTerminal - A Python-based Terminal")
+    parser.add_argument("script", nargs="?", help="run commands from a script file ('-' for stdin)")
+    parser.add_argument("-c", dest="command", help="run the given command(s) and exit")
+    parser.add_argument("-e", "--exit-on-error", action="store_true", help="stop at the first failing command")
+    parser.add_argument("--nl", action="store_true", help="interpret unknown commands as natural language in batch mode")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report the total run time")
+    args = parser.parse_args(argv)
+
+    # Create terminal instance
+    terminal = create_terminal(os.path.expanduser("~/.pyterminal_dirs"),
+                               os.path.expanduser("~/.pyterminal_hashes.db"))
+
+    try:
+        # Non-interactive fast path: no prompt_toolkit, Pygments or NLP
+        if args.command is not None or args.script:
+            return run_batch(terminal, args)
+
+        interactive(terminal)
+        return 0
+    finally:
+        terminal.close()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
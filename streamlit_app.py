@@ -2,9 +2,11 @@ import streamlit as st
 import os
 import time
 from terminal.core import Terminal
-from terminal.commands import pwd, ls, cd, mkdir, rm, help_cmd
+from terminal.commands import pwd, ls, cd, pushd, popd, dirs, z, mkdir, rm, help_cmd, sha256sum, dedupe
 from terminal.monitor import monitor_cmd, get_system_info, get_process_list
+from terminal.cluster import query_collector
 from terminal.nl_parser import parse_natural_language
+from terminal.scrollback import Scrollback
 from pygments import highlight
 from pygments.lexers.shell import BashLexer
 from pygments.formatters import HtmlFormatter
@@ -39,16 +41,24 @@ st.markdown("""
 
 # Initialize session state
 if 'terminal' not in st.session_state:
-    st.session_state.terminal = Terminal()
+    st.session_state.terminal = Terminal(os.path.expanduser("~/.pyterminal_dirs"),
+                                         os.path.expanduser("~/.pyterminal_hashes.db"))
     st.session_state.history = []
-    st.session_state.output = ""
+    st.session_state.scrollback = Scrollback()
+    st.session_state.visible_entries = 50
     
     # Register commands
     st.session_state.terminal.register_command("pwd", pwd, "Print working directory")
     st.session_state.terminal.register_command("ls", ls, "List directory contents")
     st.session_state.terminal.register_command("cd", cd, "Change directory")
+    st.session_state.terminal.register_command("pushd", pushd, "Push a directory onto the stack and change to it")
+    st.session_state.terminal.register_command("popd", popd, "Pop a directory off the stack and change to it")
+    st.session_state.terminal.register_command("dirs", dirs, "Display the directory stack")
+    st.session_state.terminal.register_command("z", z, "Jump to a frequently used directory")
     st.session_state.terminal.register_command("mkdir", mkdir, "Create a directory")
     st.session_state.terminal.register_command("rm", rm, "Remove files or directories")
+    st.session_state.terminal.register_command("sha256sum", sha256sum, "Print SHA-256 checksums of files")
+    st.session_state.terminal.register_command("dedupe", dedupe, "Find duplicate files by content")
     st.session_state.terminal.register_command("help", help_cmd, "Display help information")
     st.session_state.terminal.register_command("monitor", monitor_cmd, "Display system monitoring information")
 
@@ -69,6 +79,10 @@ with col2:
     
     st.subheader("Top Processes")
     processes_table = st.empty()
+    
+    st.subheader("Cluster")
+    collector_address = st.text_input("Collector address (host:port)", key="collector_address")
+    cluster_table = st.empty()
 
 # Function to update system metrics
 def update_metrics():
@@ -92,15 +106,65 @@ def update_metrics():
     
     processes_table.dataframe(process_data)
 
-# Update metrics on page load
+# How long a cluster view (or a failed query) is reused across reruns
+CLUSTER_TTL = 5.0
+
+def get_cluster_view(address):
+    """Query the collector at most once per CLUSTER_TTL seconds.
+
+    Failures are cached too, so an unreachable collector does not block
+    every rerun for the full connection timeout.
+    """
+    cached = st.session_state.get("cluster_cache")
+    if cached and cached[0] == address and time.time() - cached[1] < CLUSTER_TTL:
+        return cached[2], cached[3]
+    try:
+        view, error = query_collector(address, timeout=1.0), None
+    except (OSError, ValueError) as e:
+        view, error = None, str(e)
+    st.session_state.cluster_cache = (address, time.time(), view, error)
+    return view, error
+
+# Function to update the merged view of every host reporting to the collector
+def update_cluster():
+    if not collector_address:
+        return
+    view, error = get_cluster_view(collector_address)
+    if error:
+        cluster_table.error(f"Cannot reach collector: {error}")
+        return
+    cluster_data = {"Host": [], "CPU %": [], "Memory %": [], "Disk %": [], "Last seen": []}
+    for host in view:
+        cluster_data["Host"].append(host['host'])
+        cluster_data["CPU %"].append(f"{host['cpu']:.1f}%")
+        cluster_data["Memory %"].append(f"{host['memory_percent']:.1f}%")
+        cluster_data["Disk %"].append(f"{host['disk_percent']:.1f}%")
+        cluster_data["Last seen"].append(f"{host['age']:.1f}s ago")
+    cluster_table.dataframe(cluster_data)
+
+# Update metrics on page load; the cluster view is queried once per run
 update_metrics()
+update_cluster()
 
 with col1:
     st.header("Terminal")
     
-    # Display terminal output with HTML formatting
+    # Display only the visible window of the scrollback
+    scrollback = st.session_state.scrollback
     st.markdown("<h3>Output</h3>", unsafe_allow_html=True)
-    st.markdown(f"<div class='terminal-output' style='height: 300px; overflow-y: auto;'>{st.session_state.output}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='terminal-output' style='height: 300px; overflow-y: auto;'>{scrollback.render_html(st.session_state.visible_entries)}</div>", unsafe_allow_html=True)
+    
+    if len(scrollback) > st.session_state.visible_entries:
+        if st.button("Show older output"):
+            st.session_state.visible_entries += 50
+            st.rerun()
+    
+    # Page in truncated results only when asked for
+    spilled = [entry for entry in scrollback.window(st.session_state.visible_entries) if entry.spilled]
+    if spilled:
+        with st.expander("Full output"):
+            entry = st.selectbox("Command", spilled, format_func=lambda e: e.command, index=len(spilled) - 1)
+            st.code(scrollback.read_result(entry))
     
     # Command input
     with st.form(key="command_form", clear_on_submit=True):
@@ -109,7 +173,7 @@ with col1:
         
         if submit_button and user_input:
             # Parse natural language if it doesn't look like a command
-            if user_input and not user_input.split()[0] in st.session_state.terminal.commands:
+            if user_input and not st.session_state.terminal.is_command(user_input):
                 parsed_cmd = parse_natural_language(st.session_state.terminal, user_input)
                 if parsed_cmd != user_input:
                     interpreted = f"Interpreted as: {parsed_cmd}"
@@ -122,30 +186,9 @@ with col1:
             # Execute the command
             result = st.session_state.terminal.execute(user_input)
             
-            # Update output with styled command
+            # Record the command and a reference to its output
             prompt = st.session_state.terminal.get_prompt()
-            styled_prompt = f"<span class='terminal-input'>{prompt}</span>"
-            
-            # Apply syntax highlighting based on command type
-            command_parts = user_input.split()
-            if command_parts:
-                cmd = command_parts[0]
-                styled_cmd = f"<span class='terminal-command'>{cmd}</span>"
-                
-                # Style arguments (paths, etc)
-                styled_args = ""
-                if len(command_parts) > 1:
-                    args = " ".join(command_parts[1:])
-                    styled_args = f" <span class='terminal-path'>{args}</span>"
-                
-                styled_input = f"{styled_prompt}{styled_cmd}{styled_args}\n"
-                new_output = styled_input
-            if interpreted:
-                new_output += f"{interpreted}\n"
-            if result:
-                new_output += f"{result}\n"
-            
-            st.session_state.output += new_output
+            scrollback.append(prompt, user_input, result, interpreted)
             st.session_state.history.append(user_input)
             
             # Output will be displayed in the main terminal output area
@@ -156,7 +199,7 @@ with col1:
     # Help section
     with st.expander("Available Commands"):
         st.write("Basic Commands:")
-        st.code("pwd - Print working directory\nls - List directory contents\ncd - Change directory\nmkdir - Create a directory\nrm - Remove files or directories\nhelp - Display help information\nmonitor - Display system monitoring information")
+        st.code("pwd - Print working directory\nls - List directory contents\ncd - Change directory\npushd/popd/dirs - Directory stack\nz - Jump to a frequently used directory\nmkdir - Create a directory\nrm - Remove files or directories\nsha256sum - Print file checksums\ndedupe - Find duplicate files\nhelp - Display help information\nmonitor - Display system monitoring information\nmonitor --cluster host:port - Display all hosts reporting to a collector")
         
         st.write("Natural Language Examples:")
         st.code("create a folder called demo\nmove file1.txt into demo\ndelete all txt files\nwhere am I?\nlist all files")
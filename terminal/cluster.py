@@ -0,0 +1,490 @@
+"""Remote monitoring: agents stream delta-encoded snapshots to a collector.
+
+Run ``python -m terminal.cluster collector``, ``... agent --collector HOST:PORT``
+or ``... bench`` for a throughput benchmark with simulated hosts.
+"""
+import argparse
+import json
+import random
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+DEFAULT_PORT = 9700
+MAGIC = b"PT"
+VERSION = 1
+
+# Frame types
+HELLO = 1
+SNAPSHOTS = 2
+QUERY = 3
+VIEW = 4
+
+FRAME_HEADER = struct.Struct("!2sBBI")
+# Largest frame accepted; a batch of 1000 full snapshots is well below this
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+RECORD_HEADER = struct.Struct("!HH")
+PROCESS = struct.Struct("!IHHB")
+
+# Snapshot fields in bit order; percentages are sent in hundredths
+FIELDS = [
+    ("cpu", "H"),
+    ("memory_percent", "H"),
+    ("memory_available", "Q"),
+    ("memory_total", "Q"),
+    ("disk_percent", "H"),
+    ("disk_used", "Q"),
+    ("disk_free", "Q"),
+    ("disk_total", "Q"),
+]
+FIELD_STRUCTS = [struct.Struct("!" + fmt) for _, fmt in FIELDS]
+PROCESSES_BIT = 1 << len(FIELDS)
+PERCENT_FIELDS = ("cpu", "memory_percent", "disk_percent")
+
+# Agents retry a lost collector connection with exponential backoff
+RECONNECT_MIN_DELAY = 0.5
+RECONNECT_MAX_DELAY = 30.0
+# Idle agent or query connections are closed by the collector after this long
+CONNECTION_TIMEOUT = 60.0
+
+def parse_address(address, default_host="127.0.0.1"):
+    """Split 'host:port', 'host' or '[ipv6]:port' into a (host, port) tuple"""
+    if address.startswith("["):
+        host, _, rest = address[1:].partition("]")
+        port = rest[1:] if rest.startswith(":") else ""
+    elif address.count(":") == 1:
+        host, _, port = address.partition(":")
+    else:
+        # No port, or a bare IPv6 address
+        host, port = address, ""
+    return (host or default_host, int(port) if port else DEFAULT_PORT)
+
+def pct(value):
+    """Quantize a percentage to hundredths in an unsigned short"""
+    return max(0, min(65535, int(round((value or 0) * 100))))
+
+def make_snapshot(info, processes):
+    """Flatten get_system_info/get_process_list output into a snapshot"""
+    return {
+        "cpu": pct(info['cpu']),
+        "memory_percent": pct(info['memory']['percent']),
+        "memory_available": info['memory']['available'],
+        "memory_total": info['memory']['total'],
+        "disk_percent": pct(info['disk']['percent']),
+        "disk_used": info['disk']['used'],
+        "disk_free": info['disk']['free'],
+        "disk_total": info['disk']['total'],
+        "processes": tuple(
+            (proc['pid'], pct(proc['memory_percent']), pct(proc['cpu_percent']),
+             (proc['name'] or "")[:32])
+            for proc in processes
+        ),
+    }
+
+def encode_snapshot(host_id, snapshot, previous=None):
+    """Encode a snapshot, keeping only the fields that differ from previous"""
+    flags = 0
+    parts = []
+    for bit, ((name, _), packer) in enumerate(zip(FIELDS, FIELD_STRUCTS)):
+        if previous is None or previous[name] != snapshot[name]:
+            flags |= 1 << bit
+            parts.append(packer.pack(snapshot[name]))
+
+    if previous is None or previous["processes"] != snapshot["processes"]:
+        flags |= PROCESSES_BIT
+        parts.append(struct.pack("!B", len(snapshot["processes"])))
+        for pid, memory, cpu, name in snapshot["processes"]:
+            encoded = name.encode("utf-8")[:255]
+            parts.append(PROCESS.pack(pid, memory, cpu, len(encoded)) + encoded)
+    return RECORD_HEADER.pack(host_id, flags) + b"".join(parts)
+
+def decode_snapshots(payload):
+    """Decode a batch payload into (host_id, changed fields) pairs"""
+    (count,) = struct.unpack_from("!H", payload)
+    offset = 2
+    records = []
+    for _ in range(count):
+        host_id, flags = RECORD_HEADER.unpack_from(payload, offset)
+        offset += RECORD_HEADER.size
+        changes = {}
+        for bit, ((name, _), packer) in enumerate(zip(FIELDS, FIELD_STRUCTS)):
+            if flags & (1 << bit):
+                (changes[name],) = packer.unpack_from(payload, offset)
+                offset += packer.size
+
+        if flags & PROCESSES_BIT:
+            (num,) = struct.unpack_from("!B", payload, offset)
+            offset += 1
+            processes = []
+            for _ in range(num):
+                pid, memory, cpu, length = PROCESS.unpack_from(payload, offset)
+                offset += PROCESS.size
+                name = payload[offset:offset + length].decode("utf-8", "replace")
+                offset += length
+                processes.append((pid, memory, cpu, name))
+            changes["processes"] = tuple(processes)
+        records.append((host_id, changes))
+    return records
+
+def encode_frame(frame_type, payload=b""):
+    return FRAME_HEADER.pack(MAGIC, VERSION, frame_type, len(payload)) + payload
+
+def recv_exact(sock, size):
+    """Read exactly size bytes, or return None if the connection closed"""
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def read_frame(sock):
+    """Read one frame, returning (type, payload) or None at end of stream"""
+    header = recv_exact(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    magic, version, frame_type, length = FRAME_HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Invalid monitoring frame")
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Monitoring frame too large: {length} bytes")
+    payload = recv_exact(sock, length) if length else b""
+    if payload is None:
+        return None
+    return frame_type, payload
+
+def local_sample(host):
+    """Sample the local machine"""
+    from terminal.monitor import get_system_info, get_process_list
+    return get_system_info(), get_process_list(5)
+
+def simulated_sample(host, rng=random):
+    """Produce a plausible, slowly changing sample for a simulated host"""
+    gib = 1024 ** 3
+    memory_percent = rng.choice([41.5, 41.5, 41.6, 42.0])
+    info = {
+        'cpu': round(rng.uniform(0, 100), 1),
+        'memory': {'total': 16 * gib, 'available': int(16 * gib * (1 - memory_percent / 100)),
+                   'percent': memory_percent},
+        'disk': {'total': 500 * gib, 'used': 200 * gib, 'free': 300 * gib, 'percent': 40.0},
+    }
+    processes = [
+        {'pid': 100 + i, 'name': f"proc-{i}", 'memory_percent': 10.0 - i,
+         'cpu_percent': rng.choice([0.0, 0.0, 1.5])}
+        for i in range(5)
+    ]
+    return info, processes
+
+class Agent:
+    """Stream snapshots of one or more hosts to a collector.
+
+    A normal agent reports a single host. Several hosts can share one
+    agent for simulations; their snapshots are batched into one frame.
+    """
+    def __init__(self, collector, hosts=None, interval=1.0, sample=local_sample):
+        self.collector = parse_address(collector) if isinstance(collector, str) else collector
+        self.hosts = hosts or [socket.gethostname()]
+        self.interval = interval
+        self.sample = sample
+        self.sock = None
+        self.running = False
+        self.previous = {}
+        self.bytes_sent = 0
+        self.batches_sent = 0
+
+    def connect(self):
+        """Connect to the collector and announce the hosts"""
+        self.sock = socket.create_connection(self.collector)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # The collector starts from scratch, so the next snapshots are full
+        self.previous = {}
+        parts = [struct.pack("!H", len(self.hosts))]
+        for host_id, name in enumerate(self.hosts):
+            encoded = name.encode("utf-8")[:255]
+            parts.append(struct.pack("!HB", host_id, len(encoded)) + encoded)
+        self._send(encode_frame(HELLO, b"".join(parts)))
+
+    def send_once(self):
+        """Sample every host and send one batch of delta-encoded snapshots"""
+        records = [struct.pack("!H", len(self.hosts))]
+        for host_id, name in enumerate(self.hosts):
+            snapshot = make_snapshot(*self.sample(name))
+            records.append(encode_snapshot(host_id, snapshot, self.previous.get(host_id)))
+            self.previous[host_id] = snapshot
+        self._send(encode_frame(SNAPSHOTS, b"".join(records)))
+        self.batches_sent += 1
+
+    def run(self, count=None):
+        """Send a batch every interval, count times or until stopped.
+
+        If the collector goes away, the agent backs off and reconnects;
+        connect() resets the deltas so the next snapshots are full.
+        """
+        self.running = True
+        backoff = RECONNECT_MIN_DELAY
+        next_time = time.monotonic()
+        sent = 0
+        while self.running and (count is None or sent < count):
+            try:
+                if self.sock is None:
+                    self.connect()
+                self.send_once()
+            except OSError:
+                self.close()
+                time.sleep(backoff)
+                backoff = min(backoff * 2, RECONNECT_MAX_DELAY)
+                next_time = time.monotonic()
+                continue
+            backoff = RECONNECT_MIN_DELAY
+            sent += 1
+            next_time += self.interval
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def stop(self):
+        """Make run() return after the current batch"""
+        self.running = False
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+    def _send(self, data):
+        self.sock.sendall(data)
+        self.bytes_sent += len(data)
+
+class CollectorHandler(socketserver.BaseRequestHandler):
+    """Handle one agent or query connection"""
+    def setup(self):
+        self.request.settimeout(CONNECTION_TIMEOUT)
+        self.server.collector.connections.add(self.request)
+
+    def finish(self):
+        self.server.collector.connections.discard(self.request)
+
+    def handle(self):
+        collector = self.server.collector
+        names = {}
+        while True:
+            # A malformed or truncated frame drops this connection only
+            try:
+                frame = read_frame(self.request)
+                if frame is None:
+                    return
+                frame_type, payload = frame
+                if frame_type == HELLO:
+                    names = decode_hello(payload)
+                elif frame_type == SNAPSHOTS:
+                    collector.apply(names, decode_snapshots(payload))
+                elif frame_type == QUERY:
+                    view = json.dumps(collector.view()).encode("utf-8")
+                    self.request.sendall(encode_frame(VIEW, view))
+            except (OSError, ValueError, struct.error):
+                return
+
+def decode_hello(payload):
+    """Decode a HELLO payload into a host_id -> name mapping"""
+    (count,) = struct.unpack_from("!H", payload)
+    offset = 2
+    names = {}
+    for _ in range(count):
+        host_id, length = struct.unpack_from("!HB", payload, offset)
+        offset += 3
+        names[host_id] = payload[offset:offset + length].decode("utf-8", "replace")
+        offset += length
+    return names
+
+class CollectorServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+class Collector:
+    """Merge the snapshots of many agents into a single cluster view.
+
+    Each agent sends one full snapshot per host and then only the fields
+    that changed, so the collector keeps the last known state of every host
+    and applies deltas to it.
+    """
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.hosts = {}
+        self.last_seen = {}
+        self.snapshots_received = 0
+        self.lock = threading.Lock()
+        self.connections = set()
+        self.server = CollectorServer((host, port), CollectorHandler)
+        self.server.collector = self
+        self.thread = None
+
+    @property
+    def address(self):
+        return self.server.server_address
+
+    def start(self):
+        """Serve in a background thread"""
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        """Stop serving and drop every open connection"""
+        self.server.shutdown()
+        self.server.server_close()
+        for sock in list(self.connections):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def apply(self, names, records):
+        """Apply decoded snapshot deltas from one connection"""
+        now = time.time()
+        with self.lock:
+            for host_id, changes in records:
+                name = names.get(host_id, str(host_id))
+                self.hosts.setdefault(name, {}).update(changes)
+                self.last_seen[name] = now
+            self.snapshots_received += len(records)
+
+    def view(self):
+        """Return the merged state of every host, sorted by name"""
+        now = time.time()
+        with self.lock:
+            hosts = [(name, dict(state)) for name, state in sorted(self.hosts.items())]
+            last_seen = dict(self.last_seen)
+
+        view = []
+        for name, state in hosts:
+            if "processes" not in state:
+                # No full snapshot received yet
+                continue
+            entry = {"host": name, "age": round(now - last_seen[name], 1)}
+            for field, _ in FIELDS:
+                entry[field] = state[field] / 100 if field in PERCENT_FIELDS else state[field]
+            entry["processes"] = [
+                {"pid": pid, "name": proc_name, "memory_percent": memory / 100, "cpu_percent": cpu / 100}
+                for pid, memory, cpu, proc_name in state["processes"]
+            ]
+            view.append(entry)
+        return view
+
+def query_collector(address, timeout=2.0):
+    """Fetch the merged cluster view from a collector"""
+    host, port = parse_address(address) if isinstance(address, str) else address
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(encode_frame(QUERY))
+        frame = read_frame(sock)
+    if frame is None or frame[0] != VIEW:
+        raise ConnectionError("No response from collector")
+    return json.loads(frame[1].decode("utf-8"))
+
+def format_cluster_view(view):
+    """Format a cluster view as a text table"""
+    result = [
+        f"Cluster Monitor ({len(view)} hosts)",
+        "==============",
+        "Host\t\tCPU %\tMemory %\tDisk %\tTop process\tLast seen"
+    ]
+    for host in view:
+        top = host["processes"][0]["name"][:15] if host["processes"] else "-"
+        result.append(f"{host['host'][:15]}\t{host['cpu']:.1f}%\t{host['memory_percent']:.1f}%\t\t"
+                      f"{host['disk_percent']:.1f}%\t{top}\t{host['age']:.1f}s ago")
+    return "\n".join(result)
+
+def run_benchmark(hosts=100, seconds=5.0, agents=4, interval=1.0):
+    """Measure collector throughput for simulated hosts.
+
+    Phase one streams every host at the given interval and reports the
+    wire cost; phase two sends as fast as possible to find the capacity.
+    """
+    collector = Collector("127.0.0.1", 0).start()
+    names = [f"host-{i:03d}" for i in range(hosts)]
+    groups = [names[i::agents] for i in range(agents)]
+    results = []
+
+    for label, agent_interval in (("paced", interval), ("unthrottled", 0.0)):
+        pool = []
+        for group in groups:
+            rng = random.Random(len(pool))
+            agent = Agent(collector.address, group, agent_interval,
+                          lambda host, rng=rng: simulated_sample(host, rng))
+            agent.connect()
+            pool.append(agent)
+        received = collector.snapshots_received
+        stop = time.monotonic() + seconds
+
+        def drive(agent):
+            while time.monotonic() < stop:
+                agent.run(count=1)
+
+        threads = [threading.Thread(target=drive, args=(agent,)) for agent in pool]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        sent = sum(agent.batches_sent * len(agent.hosts) for agent in pool)
+        total_bytes = sum(agent.bytes_sent for agent in pool)
+        for agent in pool:
+            agent.close()
+        # Give the collector a moment to drain its sockets
+        time.sleep(0.2)
+        results.append(
+            f"{label}: {sent / elapsed:.0f} snapshots/s sent, "
+            f"{(collector.snapshots_received - received) / elapsed:.0f} snapshots/s merged, "
+            f"{total_bytes / elapsed / 1024:.1f} KiB/s, {total_bytes / max(sent, 1):.1f} bytes/snapshot"
+        )
+
+    view = collector.view()
+    collector.stop()
+    results.append(f"Hosts in view: {len(view)}/{hosts}")
+    return "\n".join(results)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PyTerminal cluster monitoring")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    collector_parser = sub.add_parser("collector", help="merge snapshots from agents")
+    collector_parser.add_argument("--host", default="127.0.0.1", help="address to listen on (0.0.0.0 for all interfaces)")
+    collector_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    agent_parser = sub.add_parser("agent", help="stream snapshots of this host")
+    agent_parser.add_argument("--collector", default=f"127.0.0.1:{DEFAULT_PORT}")
+    agent_parser.add_argument("--name", action="append", help="host name (repeat to simulate several hosts)")
+    agent_parser.add_argument("--interval", type=float, default=1.0)
+    agent_parser.add_argument("--count", type=int, help="stop after this many snapshots")
+    agent_parser.add_argument("--simulate", action="store_true", help="send simulated samples")
+
+    bench_parser = sub.add_parser("bench", help="throughput benchmark with simulated hosts")
+    bench_parser.add_argument("--hosts", type=int, default=100)
+    bench_parser.add_argument("--seconds", type=float, default=5.0)
+    bench_parser.add_argument("--agents", type=int, default=4)
+    bench_parser.add_argument("--interval", type=float, default=1.0)
+
+    args = parser.parse_args(argv)
+    try:
+        if args.mode == "collector":
+            print(f"Collecting on {args.host}:{args.port}")
+            Collector(args.host, args.port).serve_forever()
+        elif args.mode == "agent":
+            agent = Agent(args.collector, args.name, args.interval,
+                          simulated_sample if args.simulate else local_sample)
+            agent.run(args.count)
+            agent.close()
+        else:
+            print(run_benchmark(args.hosts, args.seconds, args.agents, args.interval))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
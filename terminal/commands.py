@@ -2,6 +2,8 @@ import os
 import shutil
 import glob
 from pathlib import Path
+from terminal.core import ErrorResult, compact_path, error
+from terminal.hashing import HashIndex, hash_files, find_duplicates
 
 def pwd(terminal, *args):
     """Print working directory"""
@@ -26,51 +28,78 @@ def ls(terminal, *args):
         else:
             return "  ".join(items)
     except Exception as e:
-        return f"Error: {str(e)}"
+        return error(str(e))
 
 def cd(terminal, *args):
     """Change directory"""
-    if not args:
-        # Default to home directory
-        new_dir = str(Path.home())
+    # Default to home directory
+    return terminal.change_dir(args[0] if args else str(Path.home()))
+
+def pushd(terminal, *args):
+    """Push the current directory onto the stack and change directory"""
+    if args:
+        target = args[0]
+    elif terminal.dir_stack:
+        # Like bash, swap the current directory with the top of the stack
+        target = terminal.dir_stack.pop()
     else:
-        path = args[0]
-        if path == "..":
-            new_dir = str(Path(terminal.current_dir).parent)
-        elif path.startswith("/") or path.startswith("\\") or path[1:3] == ":\\":
-            new_dir = path
-        else:
-            new_dir = os.path.join(terminal.current_dir, path)
+        return error("Directory stack empty")
     
-    if os.path.isdir(new_dir):
-        terminal.current_dir = new_dir
-        return ""
-    else:
-        return f"Error: Directory not found: {new_dir}"
+    previous = terminal.current_dir
+    result = terminal.change_dir(target)
+    if result:
+        if not args:
+            terminal.dir_stack.append(target)
+        return result
+    terminal.dir_stack.append(previous)
+    return dirs(terminal)
+
+def popd(terminal, *args):
+    """Pop a directory off the stack and change to it"""
+    if not terminal.dir_stack:
+        return error("Directory stack empty")
+    result = terminal.change_dir(terminal.dir_stack.pop())
+    return result or dirs(terminal)
+
+def dirs(terminal, *args):
+    """Display the directory stack"""
+    stack = [terminal.current_dir] + terminal.dir_stack[::-1]
+    return " ".join(compact_path(path) for path in stack)
+
+def z(terminal, *args):
+    """Jump to the most frecent directory matching the given fragments"""
+    if not args:
+        ranked = terminal.dir_index.top()
+        return "\n".join(f"{score:8.1f} {path}" for score, path in ranked)
+    
+    match = terminal.dir_index.query(*args)
+    if match is None:
+        return error(f"No directory matching: {' '.join(args)}")
+    return terminal.change_dir(match)
 
 def mkdir(terminal, *args):
     """Create a directory"""
     if not args:
-        return "Error: Directory name required"
+        return error("Directory name required")
     
     try:
         path = os.path.join(terminal.current_dir, args[0])
         os.makedirs(path, exist_ok=True)
         return f"Directory created: {args[0]}"
     except Exception as e:
-        return f"Error: {str(e)}"
+        return error(str(e))
 
 def rm(terminal, *args):
     """Remove files or directories"""
     if not args:
-        return "Error: Path required"
+        return error("Path required")
     
     recursive = "-r" in args
     if recursive:
         args = [arg for arg in args if arg != "-r"]
     
     if not args:
-        return "Error: Path required"
+        return error("Path required")
     
     path = os.path.join(terminal.current_dir, args[0])
     
@@ -80,12 +109,12 @@ def rm(terminal, *args):
                 shutil.rmtree(path)
                 return f"Directory removed: {args[0]}"
             else:
-                return f"Error: {args[0]} is a directory. Use -r to remove directories."
+                return error(f"{args[0]} is a directory. Use -r to remove directories.")
         else:
             os.remove(path)
             return f"File removed: {args[0]}"
     except Exception as e:
-        return f"Error: {str(e)}"
+        return error(str(e))
 
 def help_cmd(terminal, *args):
     """Display help information"""
@@ -93,4 +122,73 @@ def help_cmd(terminal, *args):
         return f"{args[0]}: {terminal.commands[args[0]]['help']}"
     else:
         commands = sorted(terminal.commands.keys())
-        return "Available commands:\n" + "\n".join(commands)
\ No newline at end of file
+        return "Available commands:\n" + "\n".join(commands)
+
+def parse_jobs(args):
+    """Split a '-j N' worker count off the arguments.
+
+    Returns (workers, remaining args), or (None, None) if N is not a
+    positive integer.
+    """
+    args = list(args)
+    workers = None
+    if "-j" in args:
+        i = args.index("-j")
+        value = args[i + 1] if i + 1 < len(args) else ""
+        if not value.isdigit() or int(value) < 1:
+            return None, None
+        workers = int(value)
+        del args[i:i + 2]
+    return workers, args
+
+def sha256sum(terminal, *args):
+    """Print SHA-256 checksums of files"""
+    workers, args = parse_jobs(args)
+    if args is None:
+        return error("-j requires a positive integer")
+    if not args:
+        return error("File name required")
+    
+    files = []
+    errors = []
+    for name in args:
+        path = os.path.join(terminal.current_dir, name)
+        if os.path.isdir(path):
+            errors.append(f"Error: {name} is a directory")
+        elif not os.path.isfile(path):
+            errors.append(f"Error: File not found: {name}")
+        else:
+            files.append((name, path, os.stat(path)))
+    
+    with HashIndex(terminal.hash_index_path) as index:
+        hashes = hash_files([(path, st) for _, path, st in files], index, "full", workers)
+    
+    result = []
+    for name, path, _ in files:
+        if hashes[path]:
+            result.append(f"{hashes[path]}  {name}")
+        else:
+            errors.append(f"Error: Could not read {name}")
+    output = "\n".join(errors + result)
+    return ErrorResult(output) if errors else output
+
+def dedupe(terminal, *args):
+    """Find duplicate files by content"""
+    workers, args = parse_jobs(args)
+    if args is None:
+        return error("-j requires a positive integer")
+    root = os.path.join(terminal.current_dir, args[0]) if args else terminal.current_dir
+    if not os.path.isdir(root):
+        return error(f"Directory not found: {root}")
+    
+    with HashIndex(terminal.hash_index_path) as index:
+        duplicates = find_duplicates(root, index, workers)
+    if not duplicates:
+        return "No duplicate files found"
+    
+    reclaimable = sum(size * (len(paths) - 1) for _, size, paths in duplicates)
+    result = [f"{len(duplicates)} groups of duplicate files ({reclaimable} bytes reclaimable)"]
+    for digest, size, paths in duplicates:
+        result.append(f"{digest[:16]}  {size} bytes")
+        result.extend(f"  {os.path.relpath(path, root)}" for path in paths)
+    return "\n".join(result)
@@ -1,6 +1,11 @@
+import bisect
+import glob
+import json
 import os
 import shutil
 import sys
+import time
+from functools import lru_cache
 from pathlib import Path
 
 # Use pyreadline3 on Windows, readline on Unix
@@ -15,13 +20,341 @@ except ImportError:
 
 from terminal.nl_parser import update_context
 
+WHITESPACE = " \t\n"
+GLOB_CHARS = "*?["
+
+# Directory index tuning: ranks are aged once their total exceeds
+# DIR_INDEX_MAX_RANK, and the index is written at most every
+# DIR_INDEX_SAVE_INTERVAL seconds (and on close)
+DIR_INDEX_MAX_RANK = 10000
+DIR_INDEX_SAVE_INTERVAL = 5.0
+PROMPT_MAX_LENGTH = 40
+
+def tokenize(command_line):
+    """Split a command line into words, honouring quotes and backslash escapes.
+
+    Each word is a tuple of (text, quote) segments, where quote is "" for
+    unquoted text, '"' for double-quoted text and "'" for literal text
+    (single-quoted or escaped). Returns a list of (start, word) pairs.
+    """
+    words = []
+    segments = []
+    text = []
+    quote = ""
+    start = None
+    
+    def end_segment(kind):
+        if text or kind:
+            segments.append(("".join(text), kind))
+            text.clear()
+    
+    i = 0
+    while i < len(command_line):
+        ch = command_line[i]
+        if quote == "'":
+            if ch == "'":
+                end_segment("'")
+                quote = ""
+            else:
+                text.append(ch)
+        elif quote == '"':
+            if ch == '"':
+                end_segment('"')
+                quote = ""
+            elif ch == "\\" and command_line[i + 1:i + 2] in ('$', '`', '"', '\\'):
+                end_segment('"')
+                segments.append((command_line[i + 1], "'"))
+                i += 1
+            else:
+                text.append(ch)
+        elif ch in WHITESPACE:
+            if start is not None:
+                end_segment("")
+                words.append((start, tuple(segments)))
+                segments = []
+                start = None
+        else:
+            if start is None:
+                start = i
+            if ch in "'\"":
+                end_segment("")
+                quote = ch
+            elif ch == "\\" and i + 1 < len(command_line):
+                end_segment("")
+                segments.append((command_line[i + 1], "'"))
+                i += 1
+            else:
+                text.append(ch)
+        i += 1
+    
+    if quote:
+        raise ValueError(f"Unterminated {quote} quote")
+    if start is not None:
+        end_segment("")
+        words.append((start, tuple(segments)))
+    return words
+
+def expand_word(word, cwd):
+    """Expand ~, $VAR and glob patterns in a tokenized word.
+
+    Quoted segments are not globbed and single-quoted segments are taken
+    literally. Globs are matched relative to cwd; a pattern without matches
+    is passed through unchanged, as in a POSIX shell.
+    """
+    parts = []
+    pattern = []
+    has_glob = False
+    for index, (text, quote) in enumerate(word):
+        value = text
+        if quote != "'":
+            if quote == "" and index == 0 and text.startswith("~"):
+                value = os.path.expanduser(value)
+            value = os.path.expandvars(value)
+        parts.append(value)
+        if quote == "" and any(c in value for c in GLOB_CHARS):
+            has_glob = True
+            pattern.append(value)
+        else:
+            pattern.append(glob.escape(value))
+    
+    if has_glob:
+        pattern = "".join(pattern)
+        if os.path.isabs(pattern):
+            matches = glob.glob(pattern)
+        else:
+            # Match under cwd and strip it again (glob's root_dir needs 3.10)
+            prefix = os.path.join(cwd, "")
+            matches = [match[len(prefix):] for match in glob.glob(glob.escape(prefix) + pattern)]
+        if matches:
+            return sorted(matches)
+    return ["".join(parts)]
+
+class ParsedCommand:
+    """A command line tokenized once into its command name and arguments"""
+    def __init__(self, line, words):
+        self.line = line
+        self.words = tuple(word for _, word in words)
+        literal = ["".join(text for text, _ in word) for word in self.words]
+        self.name = literal[0] if literal else ""
+        self.args = tuple(literal[1:])
+        # Raw, unparsed text following the command name
+        self.rest = line[words[1][0]:].rstrip() if len(words) > 1 else ""
+    
+    def expand_args(self, cwd):
+        """Return the arguments with ~, $VAR and globs expanded"""
+        args = []
+        for word in self.words[1:]:
+            args.extend(expand_word(word, cwd))
+        return args
+    
+    def with_name(self, name):
+        """Return the command line with the command name replaced"""
+        return f"{name} {self.rest}" if self.rest else name
+
+@lru_cache(maxsize=1024)
+def parse_command(command_line):
+    """Parse a command line, caching the result by input string"""
+    return ParsedCommand(command_line, tokenize(command_line))
+
+class ErrorResult(str):
+    """Output of a command that failed.
+
+    Commands report failures by returning one of these (usually through
+    error()) or by raising; any other output, even text that happens to
+    start with "Error", counts as success.
+    """
+
+def error(message):
+    """Build the result of a failed command"""
+    return ErrorResult(f"Error: {message}")
+
+def resolve_path(base, path):
+    """Resolve path against base into a normalized absolute path"""
+    return os.path.realpath(os.path.join(base, path))
+
+@lru_cache(maxsize=256)
+def compact_path(path, max_length=PROMPT_MAX_LENGTH):
+    """Shorten a path for display, fish-style.
+
+    The home directory is shown as '~' and, if the path is still too long,
+    every component but the last is abbreviated to its first character.
+    """
+    home = str(Path.home())
+    if path == home or path.startswith(home + os.sep):
+        path = "~" + path[len(home):]
+    if len(path) <= max_length:
+        return path
+    
+    parts = path.split(os.sep)
+    short = [part[:2] if part.startswith(".") else part[:1] for part in parts[:-1]]
+    return os.sep.join(short + parts[-1:])
+
+class DirIndex:
+    """Frecency-ranked index of visited directories, similar to zoxide.
+
+    Each directory has a rank that grows with every visit and a last access
+    time. Base names are kept in a sorted list so a query narrows down
+    candidates by bisection before ranking them by frecency. The index is
+    persisted as JSON when a path is given.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.names = []
+        self.total_rank = 0.0
+        self.dirty = False
+        self.last_save = time.time()
+        self.load()
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def load(self):
+        """Load the index from disk, ignoring a missing or corrupt file"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            entries = {path: [float(rank), float(last)] for path, (rank, last) in data.items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return
+        self.entries = entries
+        self.names = sorted((os.path.basename(path).lower(), path) for path in self.entries)
+        self.total_rank = sum(rank for rank, _ in self.entries.values())
+    
+    def save(self):
+        """Write the index to disk if it has changed.
+
+        Saving is best-effort: on failure the index stays dirty and the
+        write is retried later.
+        """
+        self.last_save = time.time()
+        if not self.path or not self.dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            return
+        self.dirty = False
+    
+    def add(self, path):
+        """Record a visit to path"""
+        now = time.time()
+        entry = self.entries.get(path)
+        if entry is None:
+            entry = self.entries[path] = [0.0, now]
+            bisect.insort(self.names, (os.path.basename(path).lower(), path))
+        entry[0] += 1
+        entry[1] = now
+        self.total_rank += 1
+        self.dirty = True
+        
+        if self.total_rank > DIR_INDEX_MAX_RANK:
+            self.age()
+        if now - self.last_save > DIR_INDEX_SAVE_INTERVAL:
+            self.save()
+    
+    def remove(self, path):
+        """Forget a directory"""
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.total_rank -= entry[0]
+            self.names.remove((os.path.basename(path).lower(), path))
+            self.dirty = True
+    
+    def age(self):
+        """Decay all ranks and drop directories that fall below 1"""
+        for path, entry in list(self.entries.items()):
+            entry[0] *= 0.9
+            if entry[0] < 1:
+                self.remove(path)
+        self.total_rank = sum(rank for rank, _ in self.entries.values())
+    
+    def score(self, path, now=None):
+        """Frecency score: the rank weighted by how recently it was visited"""
+        rank, last = self.entries[path]
+        age = (now or time.time()) - last
+        if age < 3600:
+            return rank * 4
+        elif age < 86400:
+            return rank * 2
+        elif age < 604800:
+            return rank / 2
+        return rank / 4
+    
+    def query(self, *fragments):
+        """Return the best matching directory for the given fragments, or None.
+
+        Fragments must appear in the path in order and the last one must
+        match the final component. Prefix matches on the base name are found
+        by bisection; other matches fall back to a full scan.
+        """
+        fragments = [fragment.lower() for fragment in fragments if fragment]
+        if not fragments:
+            return None
+        last = fragments[-1]
+        
+        candidates = []
+        i = bisect.bisect_left(self.names, (last,))
+        while i < len(self.names) and self.names[i][0].startswith(last):
+            candidates.append(self.names[i][1])
+            i += 1
+        best = self._best(candidates, fragments)
+        if best is None:
+            # No prefix match fits every fragment; try substring matches
+            candidates = [path for name, path in self.names
+                          if last in name and not name.startswith(last)]
+            best = self._best(candidates, fragments)
+        return best
+    
+    def top(self, limit=10):
+        """Return the highest scoring (score, path) pairs"""
+        now = time.time()
+        ranked = sorted(((self.score(path, now), path) for path in self.entries), reverse=True)
+        return ranked[:limit]
+    
+    def _best(self, candidates, fragments):
+        """Return the highest scoring existing candidate matching the fragments"""
+        now = time.time()
+        best = None
+        best_score = 0
+        for path in candidates:
+            if not self._matches(path, fragments):
+                continue
+            score = self.score(path, now)
+            if score > best_score:
+                if not os.path.isdir(path):
+                    self.remove(path)
+                    continue
+                best, best_score = path, score
+        return best
+    
+    def _matches(self, path, fragments):
+        """Check that the fragments appear in order within path"""
+        lowered = path.lower()
+        position = 0
+        for fragment in fragments:
+            position = lowered.find(fragment, position)
+            if position < 0:
+                return False
+            position += len(fragment)
+        return True
+
 class Terminal:
-    def __init__(self):
+    def __init__(self, dir_index_path=None, hash_index_path=None):
         self.current_dir = os.getcwd()
+        self.hash_index_path = hash_index_path
+        self.dir_index = DirIndex(dir_index_path)
+        self.dir_stack = []
         self.commands = {}
         self.history = []
         self.command_suggestions = []
         self.last_executed_command = ""
+        self.last_status = 0
     
     def register_command(self, name, func, help_text="No help available"):
         """Register a command with the terminal"""
@@ -30,6 +363,17 @@ class Terminal:
             'help': help_text
         }
     
+    def is_command(self, command_line):
+        """Check whether a line starts with a registered command.
+
+        Lines that are not valid shell syntax, such as English text with an
+        apostrophe, are not commands and should go to natural language parsing.
+        """
+        try:
+            return parse_command(command_line).name in self.commands
+        except ValueError:
+            return False
+    
     def get_command_completions(self, text, state):
         """Return command completions for readline"""
         # Get all command names that start with the text
@@ -56,34 +400,61 @@ class Terminal:
         return self.command_suggestions[state] if state < len(self.command_suggestions) else None
     
     def execute(self, command_line):
-        """Execute a command"""
-        if not command_line.strip():
+        """Execute a command line or an already parsed command"""
+        self.last_status = 0
+        if isinstance(command_line, ParsedCommand):
+            parsed = command_line
+        else:
+            if not command_line.strip():
+                return ""
+            try:
+                parsed = parse_command(command_line)
+            except ValueError as e:
+                self.last_status = 2
+                return error(str(e))
+        
+        if not parsed.words:
             return ""
             
-        self.history.append(command_line)
-        self.last_executed_command = command_line
+        self.history.append(parsed.line)
+        self.last_executed_command = parsed.line
         
-        # Parse the command line
-        parts = command_line.split()
-        command = parts[0]
-        args = parts[1:] if len(parts) > 1 else []
+        command = parsed.name
         
         # Execute the command if it exists
         result = ""
         if command in self.commands:
             try:
+                args = parsed.expand_args(self.current_dir)
                 result = self.commands[command]['func'](self, *args)
                 # Update context with the executed command and its result
-                update_context(command_line, result)
+                update_context(parsed, result, args)
+                if isinstance(result, ErrorResult):
+                    self.last_status = 1
                 return result
             except Exception as e:
-                return f"Error: {str(e)}"
+                self.last_status = 1
+                return error(str(e))
         else:
-            return f"Command not found: {command}"
+            self.last_status = 127
+            return ErrorResult(f"Command not found: {command}")
+    
+    def change_dir(self, path):
+        """Change the current directory and record it in the directory index"""
+        new_dir = resolve_path(self.current_dir, path)
+        if not os.path.isdir(new_dir):
+            return error(f"Directory not found: {new_dir}")
+        self.current_dir = new_dir
+        self.dir_index.add(new_dir)
+        return ""
     
     def get_prompt(self):
         """Get the terminal prompt"""
-        return f"{self.current_dir} $ "
+        return f"{compact_path(self.current_dir)} $ "
+    
+    def close(self):
+        """Persist terminal state"""
+        self.dir_index.save()
     
     def setup_autocomplete(self):
         """Set up tab completion for commands"""
@@ -0,0 +1,176 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# Size of the blocks hashed from each end of a file for the partial hash
+BLOCK_SIZE = 64 * 1024
+# Below this many bytes to hash, a process pool costs more than it saves
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+class HashIndex:
+    """On-disk cache of file hashes.
+
+    Entries are keyed by (device, inode) and only trusted while the file's
+    size and mtime still match, so repeat scans only hash changed files.
+    Without a path the cache lives in memory for a single scan.
+    """
+    def __init__(self, path=None):
+        self.conn = sqlite3.connect(path or ":memory:")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "dev INTEGER, inode INTEGER, size INTEGER, mtime_ns INTEGER, "
+            "partial TEXT, full TEXT, PRIMARY KEY (dev, inode))"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, st, kind):
+        """Return the cached 'partial' or 'full' hash for a stat result, or None"""
+        row = self.conn.execute(
+            f"SELECT {kind} FROM hashes WHERE dev = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+            (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, kind, items):
+        """Store (stat result, hash) pairs, dropping hashes of older file versions"""
+        other = "full" if kind == "partial" else "partial"
+        self.conn.executemany(
+            f"INSERT INTO hashes (dev, inode, size, mtime_ns, {kind}) VALUES (?, ?, ?, ?, ?) "
+            f"ON CONFLICT (dev, inode) DO UPDATE SET "
+            f"{other} = CASE WHEN size = excluded.size AND mtime_ns = excluded.mtime_ns "
+            f"THEN {other} ELSE NULL END, "
+            f"{kind} = excluded.{kind}, size = excluded.size, mtime_ns = excluded.mtime_ns",
+            [(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, value) for st, value in items]
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+def partial_hash(path):
+    """Hash the size and the first and last blocks of a file.
+
+    Files of at most two blocks are read whole, so their partial hash is
+    the SHA-256 of their contents, the same as full_hash().
+    """
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size <= 2 * BLOCK_SIZE:
+                return hashlib.sha256(f.read()).hexdigest()
+            digest = hashlib.sha256(str(size).encode())
+            digest.update(f.read(BLOCK_SIZE))
+            f.seek(size - BLOCK_SIZE)
+            digest.update(f.read(BLOCK_SIZE))
+            return digest.hexdigest()
+    except OSError:
+        return None
+
+def full_hash(path):
+    """Hash a whole file through a read-only memory map"""
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return hashlib.sha256().hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+    except (OSError, ValueError):
+        return None
+
+def hash_files(files, index, kind="full", workers=None):
+    """Hash (path, stat result) pairs, using the index and a process pool.
+
+    Returns a dict mapping path to hash; unreadable files map to None.
+    """
+    results = {}
+    pending = []
+    for path, st in files:
+        cached = index.get(st, kind)
+        if cached:
+            results[path] = cached
+        else:
+            pending.append((path, st))
+    if not pending:
+        return results
+
+    func = full_hash if kind == "full" else partial_hash
+    paths = [path for path, _ in pending]
+    to_read = sum(min(st.st_size, 2 * BLOCK_SIZE) if kind == "partial" else st.st_size
+                  for _, st in pending)
+    if workers != 1 and len(pending) > 1 and to_read >= PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            hashes = list(pool.map(func, paths, chunksize=max(1, len(paths) // 64)))
+    else:
+        hashes = [func(path) for path in paths]
+
+    index.put_many(kind, [(st, value) for (_, st), value in zip(pending, hashes) if value])
+    results.update(zip(paths, hashes))
+    return results
+
+def scan_files(root):
+    """Yield (path, stat result) for regular files under root, skipping symlinks"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    # DirEntry.stat() leaves st_ino empty on Windows
+                    yield entry.path, os.lstat(entry.path)
+            except OSError:
+                continue
+
+def group_by(files, key):
+    """Group (path, stat result) pairs by key, keeping groups of two or more"""
+    groups = defaultdict(list)
+    for item in files:
+        value = key(item)
+        if value is not None:
+            groups[value].append(item)
+    return [group for group in groups.values() if len(group) > 1]
+
+def find_duplicates(root, index, workers=None, min_size=1):
+    """Find groups of files under root with identical contents.
+
+    Candidates are narrowed by size, then by a partial hash of their first
+    and last blocks, and only the remaining files larger than two blocks
+    are hashed in full.
+    Hard links to the same inode are counted once. Returns a list of
+    (hash, size, paths) tuples, largest files first.
+    """
+    seen = set()
+    files = []
+    for path, st in scan_files(root):
+        if st.st_size < min_size or (st.st_dev, st.st_ino) in seen:
+            continue
+        seen.add((st.st_dev, st.st_ino))
+        files.append((path, st))
+
+    candidates = [item for group in group_by(files, lambda item: item[1].st_size) for item in group]
+    partial = hash_files(candidates, index, "partial", workers)
+    candidates = [item for group in group_by(candidates, lambda item: partial[item[0]]) for item in group]
+    # Small files were read whole by the partial hash; only hash the rest again
+    full = {path: partial[path] for path, st in candidates if st.st_size <= 2 * BLOCK_SIZE}
+    large = [(path, st) for path, st in candidates if st.st_size > 2 * BLOCK_SIZE]
+    full.update(hash_files(large, index, "full", workers))
+
+    duplicates = []
+    for group in group_by(candidates, lambda item: full[item[0]]):
+        paths = sorted(path for path, _ in group)
+        duplicates.append((full[group[0][0]], group[0][1].st_size, paths))
+    duplicates.sort(key=lambda dup: (-dup[1], dup[2]))
+    return duplicates
@@ -1,5 +1,7 @@
 import psutil
 import time
+from terminal.core import error
+from terminal.cluster import DEFAULT_PORT, format_cluster_view, query_collector
 
 def get_system_info():
     """Get system information"""
@@ -38,6 +40,14 @@ def get_process_list(limit=10):
 
 def monitor_cmd(terminal, *args):
     """Display system monitoring information"""
+    if args and args[0] == "--cluster":
+        # Merged view of every host reporting to a collector
+        address = args[1] if len(args) > 1 else f"127.0.0.1:{DEFAULT_PORT}"
+        try:
+            return format_cluster_view(query_collector(address))
+        except (OSError, ValueError) as e:
+            return error(f"Cannot reach collector at {address}: {str(e)}")
+    
     info = get_system_info()
     processes = get_process_list(5)
     
@@ -1,6 +1,7 @@
 import re
 import os
-import spacy
+import shlex
+import sys
 from Levenshtein import distance
 
 # Global variables for context awareness
@@ -9,37 +10,50 @@ last_created_file = ""
 last_created_dir = ""
 last_modified_file = ""
 
-# Load spaCy model - use 'python -m spacy download en_core_web_sm' to download
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    # Fallback if model not installed
-    print("Warning: spaCy model not found. Using basic NLP parsing.")
-    nlp = None
+# spaCy model, loaded on first use so that plain command execution stays fast
+nlp = None
+nlp_loaded = False
 
-def update_context(command, result):
-    """Update context based on executed command"""
+def get_nlp():
+    """Load the spaCy model the first time it is needed"""
+    global nlp, nlp_loaded
+    
+    if not nlp_loaded:
+        nlp_loaded = True
+        # Use 'python -m spacy download en_core_web_sm' to download the model
+        try:
+            import spacy
+            nlp = spacy.load("en_core_web_sm")
+        except:
+            # Fallback if spaCy or the model is not installed
+            print("Warning: spaCy model not found. Using basic NLP parsing.", file=sys.stderr)
+            nlp = None
+    return nlp
+
+def update_context(command, result, args=None):
+    """Update context based on an executed, already parsed command.
+
+    args are the expanded arguments the command actually ran with; they
+    default to the literal arguments of the parsed command.
+    """
     global last_command, last_created_file, last_created_dir, last_modified_file
     
-    last_command = command
+    last_command = command.line
+    args = list(command.args if args is None else args)
     
     # Track file/directory creation
-    if command.startswith("mkdir "):
-        dir_name = command.split(" ", 1)[1]
-        last_created_dir = dir_name
+    if command.name == "mkdir" and args:
+        last_created_dir = args[0]
     
     # Track file creation/modification
-    elif command.startswith("touch ") or command.startswith("echo "):
+    elif command.name in ("touch", "echo"):
         # Extract filename from touch command or echo redirection
-        if command.startswith("touch "):
-            file_name = command.split(" ", 1)[1]
-        else:
+        file_name = ""
+        if command.name == "touch" and args:
+            file_name = args[0]
+        elif ">" in args[:-1]:
             # Handle echo with redirection
-            match = re.search(r'echo .* > ([\w\d_.-]+)', command)
-            if match:
-                file_name = match.group(1)
-            else:
-                file_name = ""
+            file_name = args[args.index(">") + 1]
         
         if file_name:
             last_created_file = file_name
@@ -73,18 +87,18 @@ def parse_natural_language(terminal, text):
     if "last file" in text or "the file i just created" in text:
         if "delete" in text or "remove" in text:
             if last_created_file:
-                return f"rm {last_created_file}"
+                return f"rm {shlex.quote(last_created_file)}"
         elif "show" in text or "display" in text or "cat" in text:
             if last_created_file:
-                return f"cat {last_created_file}"
+                return f"cat {shlex.quote(last_created_file)}"
     
     if "last directory" in text or "the folder i just created" in text:
         if "delete" in text or "remove" in text:
             if last_created_dir:
-                return f"rm -r {last_created_dir}"
+                return f"rm -r {shlex.quote(last_created_dir)}"
         elif "go to" in text or "change to" in text or "cd" in text:
             if last_created_dir:
-                return f"cd {last_created_dir}"
+                return f"cd {shlex.quote(last_created_dir)}"
     
     if "undo" in text or "revert" in text:
         # Simple undo by returning to previous directory
@@ -92,6 +106,7 @@ def parse_natural_language(terminal, text):
             return "cd .."
     
     # Use spaCy for more advanced parsing if available
+    nlp = get_nlp()
     if nlp:
         doc = nlp(text)
         
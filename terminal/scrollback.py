@@ -0,0 +1,146 @@
+import html
+import tempfile
+from collections import deque
+from terminal.core import parse_command
+
+class ScrollbackEntry:
+    """A single command and a reference to its output"""
+    def __init__(self, prompt, command, interpreted="", result="", offset=None, length=0):
+        self.prompt = prompt
+        self.command = command
+        self.interpreted = interpreted
+        # Command name and raw arguments for highlighting, split once on append
+        try:
+            parsed = parse_command(command)
+            self.name, self.rest = parsed.name, parsed.rest
+        except ValueError:
+            self.name, self.rest = command, ""
+        # Small results are kept inline; large ones live in the spill file
+        self.result = result
+        self.offset = offset
+        self.length = length
+
+    @property
+    def spilled(self):
+        return self.offset is not None
+
+    def size(self):
+        """Approximate number of bytes this entry keeps in memory, counted as UTF-8"""
+        return sum(len(text.encode("utf-8")) for text in (self.prompt, self.command, self.interpreted, self.result))
+
+class Scrollback:
+    """Bounded scrollback buffer for the web front end.
+
+    Entries are kept in a deque and evicted oldest-first once the in-memory
+    or spilled byte totals exceed their caps. Results larger than
+    ``spill_threshold`` are written to a temporary spill file and only a
+    short preview is kept in memory; the full text is paged in on demand.
+    """
+    def __init__(self, max_bytes=256 * 1024, max_spill_bytes=64 * 1024 * 1024,
+                 spill_threshold=4096, preview_chars=1024):
+        self.entries = deque()
+        self.max_bytes = max_bytes
+        self.max_spill_bytes = max_spill_bytes
+        self.spill_threshold = spill_threshold
+        self.preview_chars = preview_chars
+        self.memory_bytes = 0
+        self.spill_bytes = 0
+        self.spill_file = None
+        self.spill_end = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def append(self, prompt, command, result="", interpreted=""):
+        """Record a command and its output, evicting old entries if needed"""
+        result = result or ""
+        entry = ScrollbackEntry(prompt, command, interpreted)
+        data = result.encode("utf-8")
+        if len(data) > self.spill_threshold:
+            entry.offset, entry.length = self._spill(data)
+            entry.result = result[:self.preview_chars]
+            self.spill_bytes += entry.length
+        else:
+            entry.result = result
+
+        self.entries.append(entry)
+        self.memory_bytes += entry.size()
+        self._evict()
+        return entry
+
+    def read_result(self, entry):
+        """Return the full output of an entry, reading it back from disk if spilled"""
+        if not entry.spilled:
+            return entry.result
+        self.spill_file.seek(entry.offset)
+        return self.spill_file.read(entry.length).decode("utf-8")
+
+    def window(self, count):
+        """Return the most recent ``count`` entries, oldest first"""
+        if count >= len(self.entries):
+            return list(self.entries)
+        return [self.entries[i] for i in range(len(self.entries) - count, len(self.entries))]
+
+    def render_html(self, count=50):
+        """Render the visible window as escaped HTML"""
+        lines = []
+        for entry in self.window(count):
+            line = (f"<span class='terminal-input'>{html.escape(entry.prompt)}</span>"
+                    f"<span class='terminal-command'>{html.escape(entry.name)}</span>")
+            if entry.rest:
+                line += f" <span class='terminal-path'>{html.escape(entry.rest)}</span>"
+            lines.append(line)
+            if entry.interpreted:
+                lines.append(html.escape(entry.interpreted))
+            if entry.result:
+                lines.append(html.escape(entry.result))
+            if entry.spilled:
+                hidden = entry.length - len(entry.result.encode("utf-8"))
+                lines.append(f"<i>... output truncated ({hidden} more bytes)</i>")
+        return "\n".join(lines)
+
+    def clear(self):
+        """Drop all entries and release the spill file"""
+        self.entries.clear()
+        self.memory_bytes = 0
+        self.spill_bytes = 0
+        self.spill_end = 0
+        if self.spill_file:
+            self.spill_file.close()
+            self.spill_file = None
+
+    def _spill(self, data):
+        """Append data to the spill file and return its (offset, length)"""
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile(prefix="pyterminal-scrollback-")
+        # Reclaim the dead space left by evicted entries once it dominates the file
+        if self.spill_end > 2 * self.spill_bytes + self.spill_threshold:
+            self._compact()
+        offset = self.spill_end
+        self.spill_file.seek(offset)
+        self.spill_file.write(data)
+        self.spill_end += len(data)
+        return offset, len(data)
+
+    def _compact(self):
+        """Rewrite the spill file keeping only live entries"""
+        new_file = tempfile.TemporaryFile(prefix="pyterminal-scrollback-")
+        end = 0
+        for entry in self.entries:
+            if entry.spilled:
+                self.spill_file.seek(entry.offset)
+                new_file.write(self.spill_file.read(entry.length))
+                entry.offset = end
+                end += entry.length
+        self.spill_file.close()
+        self.spill_file = new_file
+        self.spill_end = end
+
+    def _evict(self):
+        """Drop the oldest entries until both byte caps are respected"""
+        while len(self.entries) > 1 and (self.memory_bytes > self.max_bytes or
+                                         self.spill_bytes > self.max_spill_bytes):
+            entry = self.entries.popleft()
+            self.memory_bytes -= entry.size()
+            if entry.spilled:
+                self.spill_bytes -= entry.length
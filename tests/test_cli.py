@@ -0,0 +1,70 @@
+import io
+import os
+import subprocess
+import sys
+import pytest
+from cli import create_terminal, run_lines, main
+
+@pytest.fixture
+def terminal(tmp_path):
+    """Create a CLI terminal rooted in a temporary directory"""
+    term = create_terminal()
+    term.current_dir = str(tmp_path)
+    return term
+
+def test_run_lines(terminal, tmp_path):
+    """Test running a script skips comments and blank lines"""
+    out = io.StringIO()
+    count, errors = run_lines(terminal, ["# setup", "", "mkdir demo", "cd demo", "pwd"], out=out)
+    assert (count, errors) == (3, 0)
+    assert out.getvalue().splitlines() == ["Directory created: demo", os.path.join(str(tmp_path), "demo")]
+
+def test_run_lines_exit_on_error(terminal):
+    """Test that execution stops at the first error when asked"""
+    out = io.StringIO()
+    count, errors = run_lines(terminal, ["cd missing", "pwd"], out=out)
+    assert (count, errors) == (2, 1)
+
+    count, errors = run_lines(terminal, ["nosuchcommand", "pwd"], exit_on_error=True, out=out)
+    assert (count, errors) == (1, 1)
+    assert terminal.last_status == 127
+
+def test_script_mode(tmp_path, capsys, monkeypatch):
+    """Test running a script file without loading the interactive front end"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    script = tmp_path / "setup.pyt"
+    script.write_text(f"cd '{tmp_path}'\nmkdir a\nmkdir b\n")
+    assert main([str(script)]) == 0
+    assert os.path.isdir(tmp_path / "a") and os.path.isdir(tmp_path / "b")
+    assert "Ran 3 commands" in capsys.readouterr().err
+
+def test_batch_mode_skips_heavy_imports(tmp_path):
+    """Test that batch mode does not load prompt_toolkit, Pygments, spaCy or psutil"""
+    code = ("import sys, cli; cli.main(['-q', '-c', 'pwd']); "
+            "print([m for m in ('prompt_toolkit', 'pygments', 'spacy', 'psutil') if m in sys.modules])")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True,
+                            env=dict(os.environ, HOME=str(tmp_path)))
+    assert result.stdout.splitlines()[-1] == "[]"
+
+def test_command_mode(tmp_path, capsys, monkeypatch):
+    """Test -c mode returns a failing exit code on errors"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert main(["-q", "-c", "cd /nonexistent/dir"]) == 1
+    assert "Directory not found" in capsys.readouterr().out
+
+def test_run_lines_natural_language_with_apostrophe(terminal, tmp_path):
+    """Test that English input that is not valid shell syntax reaches the NL parser"""
+    assert not terminal.is_command("what's the current directory")
+    out = io.StringIO()
+    count, errors = run_lines(terminal, ["what's the current directory"], use_nl=True, out=out)
+    assert (count, errors) == (1, 0)
+    assert out.getvalue().strip() == str(tmp_path)
+
+def test_output_starting_with_error_is_not_a_failure(terminal, tmp_path):
+    """Test that only real command failures count towards the status"""
+    (tmp_path / "log.txt").write_text("Error count: 0\n")
+    out = io.StringIO()
+    count, errors = run_lines(terminal, ["cat log.txt", "pwd"], exit_on_error=True, out=out)
+    assert (count, errors) == (2, 0)
+    assert out.getvalue().startswith("Error count: 0")
@@ -0,0 +1,111 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from terminal.cluster import (DEFAULT_PORT, FRAME_HEADER, HELLO, MAGIC, MAX_FRAME_SIZE, SNAPSHOTS, VERSION, Agent,
+                              Collector, decode_snapshots, encode_frame, encode_snapshot, make_snapshot,
+                              parse_address, query_collector, simulated_sample)
+from terminal.monitor import monitor_cmd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def collector():
+    """Start a collector on an ephemeral localhost port"""
+    collector = Collector("127.0.0.1", 0).start()
+    yield collector
+    collector.stop()
+
+def test_parse_address():
+    """Test host, host:port and bracketed IPv6 addresses"""
+    assert parse_address("monitor-host") == ("monitor-host", DEFAULT_PORT)
+    assert parse_address("monitor-host:9800") == ("monitor-host", 9800)
+    assert parse_address(":9800") == ("127.0.0.1", 9800)
+    assert parse_address("[::1]:9800") == ("::1", 9800)
+    assert parse_address("[::1]") == ("::1", DEFAULT_PORT)
+    assert parse_address("::1") == ("::1", DEFAULT_PORT)
+
+def test_snapshot_roundtrip():
+    """Test that full and delta snapshots decode to the same state"""
+    first = make_snapshot(*simulated_sample("a"))
+    second = dict(first, cpu=first["cpu"] + 1)
+
+    full = encode_snapshot(7, first)
+    delta = encode_snapshot(7, second, first)
+    assert len(delta) < len(full)
+
+    state = {}
+    for payload in (full, delta):
+        for host_id, changes in decode_snapshots(b"\x00\x01" + payload):
+            assert host_id == 7
+            state.update(changes)
+    assert state == second
+
+def test_cluster_with_local_agents(collector):
+    """Test that several agent processes are merged into one view"""
+    address = f"127.0.0.1:{collector.address[1]}"
+    agents = [
+        subprocess.Popen([sys.executable, "-m", "terminal.cluster", "agent", "--collector", address,
+                          "--name", f"node-{i}", "--simulate", "--interval", "0.05", "--count", "5"],
+                         cwd=ROOT)
+        for i in range(3)
+    ]
+    for agent in agents:
+        assert agent.wait(timeout=30) == 0
+
+    deadline = time.time() + 5
+    while time.time() < deadline and collector.snapshots_received < 15:
+        time.sleep(0.05)
+    view = query_collector(address)
+    assert [host["host"] for host in view] == ["node-0", "node-1", "node-2"]
+    assert len(view[0]["processes"]) == 5
+    assert view[0]["disk_percent"] == 40.0
+
+    result = monitor_cmd(None, "--cluster", address)
+    assert "Cluster Monitor (3 hosts)" in result
+    assert "node-2" in result
+
+def test_cluster_unreachable():
+    """Test monitor --cluster reports an unreachable collector"""
+    assert monitor_cmd(None, "--cluster", "127.0.0.1:1").startswith("Error")
+
+def test_agent_reconnects_after_collector_restart(collector):
+    """Test that an agent reconnects and resends full snapshots"""
+    port = collector.address[1]
+    agent = Agent(("127.0.0.1", port), ["node"], 0.02, simulated_sample)
+    thread = threading.Thread(target=agent.run, daemon=True)
+    thread.start()
+    try:
+        deadline = time.time() + 5
+        while time.time() < deadline and not collector.view():
+            time.sleep(0.02)
+        collector.stop()
+
+        restarted = Collector("127.0.0.1", port).start()
+        try:
+            deadline = time.time() + 10
+            while time.time() < deadline and not restarted.view():
+                time.sleep(0.05)
+            assert [host["host"] for host in restarted.view()] == ["node"]
+            assert thread.is_alive()
+        finally:
+            restarted.stop()
+    finally:
+        agent.stop()
+        thread.join(timeout=5)
+
+def test_collector_survives_malformed_frames(collector):
+    """Test that bad frames close their connection without affecting the collector"""
+    address = collector.address
+    truncated = encode_frame(SNAPSHOTS, b"\x00\x05\x00\x00\xff")
+    oversized = FRAME_HEADER.pack(MAGIC, VERSION, SNAPSHOTS, MAX_FRAME_SIZE + 1)
+    for frame in (truncated, oversized, encode_frame(HELLO, b"\x00\x09")):
+        with socket.create_connection(address) as sock:
+            sock.sendall(frame)
+            sock.settimeout(5)
+            assert sock.recv(1) == b""
+
+    assert query_collector(address) == []
@@ -1,8 +1,9 @@
+import hashlib
 import os
 import shutil
 import pytest
 from terminal.core import Terminal
-from terminal.commands import pwd, ls, cd, mkdir, rm
+from terminal.commands import pwd, ls, cd, pushd, popd, z, mkdir, rm, sha256sum, dedupe
 
 @pytest.fixture
 def terminal():
@@ -13,6 +14,11 @@ def terminal():
     term.register_command("cd", cd, "Change directory")
     term.register_command("mkdir", mkdir, "Create a directory")
     term.register_command("rm", rm, "Remove files or directories")
+    term.register_command("pushd", pushd, "Push a directory onto the stack and change to it")
+    term.register_command("popd", popd, "Pop a directory off the stack and change to it")
+    term.register_command("z", z, "Jump to a frequently used directory")
+    term.register_command("sha256sum", sha256sum, "Print SHA-256 checksums of files")
+    term.register_command("dedupe", dedupe, "Find duplicate files by content")
     return term
 
 @pytest.fixture
@@ -80,4 +86,125 @@ def test_rm(terminal, test_dir):
     # Remove directory with -r
     result = terminal.execute("rm -r testdir")
     assert "Directory removed" in result
-    assert not os.path.exists(os.path.join(test_dir, "testdir"))
\ No newline at end of file
+    assert not os.path.exists(os.path.join(test_dir, "testdir"))
+
+def test_cd_normalizes_paths(terminal, test_dir):
+    """Test that cd resolves nested '..' and symlinks"""
+    os.makedirs(os.path.join(test_dir, "a", "b", "c"))
+    os.symlink(os.path.join(test_dir, "a", "b"), os.path.join(test_dir, "link"))
+    terminal.current_dir = str(test_dir)
+
+    assert terminal.execute("cd a/b/c") == ""
+    assert terminal.execute("cd ../..") == ""
+    assert terminal.current_dir == os.path.join(str(test_dir), "a")
+
+    assert terminal.execute("cd ../link") == ""
+    assert terminal.current_dir == os.path.join(str(test_dir), "a", "b")
+
+def test_pushd_popd(terminal, test_dir):
+    """Test the directory stack commands"""
+    os.makedirs(os.path.join(test_dir, "one"))
+    terminal.current_dir = str(test_dir)
+
+    terminal.execute("pushd one")
+    assert terminal.current_dir == os.path.join(str(test_dir), "one")
+    assert terminal.dir_stack == [str(test_dir)]
+
+    terminal.execute("pushd")
+    assert terminal.current_dir == str(test_dir)
+
+    terminal.execute("popd")
+    assert terminal.current_dir == os.path.join(str(test_dir), "one")
+    assert "Error" in terminal.execute("popd")
+
+def test_z(terminal, test_dir):
+    """Test jumping to a frecent directory by fragment"""
+    project = os.path.join(str(test_dir), "src", "project")
+    other = os.path.join(str(test_dir), "docs", "projects")
+    os.makedirs(project)
+    os.makedirs(other)
+    terminal.current_dir = str(test_dir)
+
+    for _ in range(3):
+        terminal.execute(f"cd {project}")
+    terminal.execute(f"cd {other}")
+
+    assert terminal.execute("z proj") == ""
+    assert terminal.current_dir == project
+    assert terminal.execute("z docs proj") == ""
+    assert terminal.current_dir == other
+    assert "Error" in terminal.execute("z nothing")
+
+    # Prefix matches that miss an earlier fragment fall back to substrings
+    mine = os.path.join(str(test_dir), "docs", "myproj")
+    os.makedirs(mine)
+    terminal.execute(f"cd {mine}")
+    terminal.dir_index.remove(other)
+    assert terminal.execute("z docs proj") == ""
+    assert terminal.current_dir == mine
+
+def test_sha256sum(terminal, test_dir):
+    """Test sha256sum command"""
+    terminal.current_dir = str(test_dir)
+    terminal.hash_index_path = str(test_dir / "hashes.db")
+    with open(os.path.join(test_dir, "a.txt"), "wb") as f:
+        f.write(b"hello")
+
+    result = terminal.execute("sha256sum a.txt")
+    assert result == f"{hashlib.sha256(b'hello').hexdigest()}  a.txt"
+    assert "Error" in terminal.execute("sha256sum missing.txt")
+
+    # A changed file must not be served from the cache
+    with open(os.path.join(test_dir, "a.txt"), "wb") as f:
+        f.write(b"hello world")
+    os.utime(os.path.join(test_dir, "a.txt"), ns=(0, 1))
+    result = terminal.execute("sha256sum a.txt")
+    assert result.startswith(hashlib.sha256(b"hello world").hexdigest())
+
+def test_dedupe(terminal, test_dir):
+    """Test dedupe command"""
+    terminal.current_dir = str(test_dir)
+    terminal.hash_index_path = str(test_dir / "hashes.db")
+    os.makedirs(os.path.join(test_dir, "data", "sub"))
+    big = os.urandom(200 * 1024)
+    files = {
+        "data/one.bin": big,
+        "data/sub/two.bin": big,
+        # Same size, first and last blocks as the duplicates but a different middle
+        "data/three.bin": big[:100 * 1024] + b"x" + big[100 * 1024 + 1:],
+        "data/small.txt": b"abc",
+        "data/other.txt": b"abd",
+    }
+    for name, content in files.items():
+        with open(os.path.join(test_dir, name), "wb") as f:
+            f.write(content)
+    os.link(os.path.join(test_dir, "data/small.txt"), os.path.join(test_dir, "data/hardlink.txt"))
+
+    result = terminal.execute("dedupe data")
+    assert result.startswith("1 groups of duplicate files (204800 bytes reclaimable)")
+    assert os.path.join("sub", "two.bin") in result
+    assert "three.bin" not in result
+    assert "hardlink.txt" not in result
+
+    # A second scan is served from the on-disk index
+    assert terminal.execute("dedupe data -j 2") == result
+
+def test_hashing_jobs_option(terminal, test_dir):
+    """Test that an invalid -j value is reported"""
+    terminal.current_dir = str(test_dir)
+    for args in ("-j", "-j x", "-j 0"):
+        assert terminal.execute(f"dedupe {args}") == "Error: -j requires a positive integer"
+        assert terminal.execute(f"sha256sum a.txt {args}") == "Error: -j requires a positive integer"
+
+def test_dedupe_small_files_hashed_once(terminal, test_dir, monkeypatch):
+    """Test that small files are not hashed a second time in full"""
+    from terminal import hashing
+    monkeypatch.setattr(hashing, "full_hash", lambda path: pytest.fail("full hash of a small file"))
+    terminal.current_dir = str(test_dir)
+    for name in ("x.txt", "y.txt"):
+        with open(os.path.join(test_dir, name), "wb") as f:
+            f.write(b"same")
+
+    result = terminal.execute("dedupe")
+    assert hashlib.sha256(b"same").hexdigest()[:16] in result
+    assert "x.txt" in result and "y.txt" in result
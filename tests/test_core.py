@@ -0,0 +1,130 @@
+import os
+import pytest
+from terminal.core import Terminal, DirIndex, compact_path, parse_command, resolve_path
+from terminal.commands import cd, mkdir
+
+@pytest.fixture
+def terminal(tmp_path):
+    """Create a terminal instance rooted in a temporary directory"""
+    term = Terminal()
+    term.register_command("cd", cd, "Change directory")
+    term.register_command("mkdir", mkdir, "Create a directory")
+    term.register_command("echo", lambda t, *args: "|".join(args), "Echo arguments")
+    term.current_dir = str(tmp_path)
+    return term
+
+def test_quotes_and_escapes():
+    """Test that quoted words and escapes are kept together"""
+    parsed = parse_command("""cp "my file.txt" 'other dir'/x a\\ b""")
+    assert parsed.name == "cp"
+    assert parsed.args == ("my file.txt", "other dir/x", "a b")
+
+def test_unterminated_quote(terminal):
+    """Test that an unterminated quote is reported as an error"""
+    with pytest.raises(ValueError):
+        parse_command("echo 'oops")
+    assert terminal.execute("echo 'oops").startswith("Error")
+
+def test_parse_is_cached():
+    """Test that the same input string is parsed only once"""
+    assert parse_command("ls -l") is parse_command("ls -l")
+
+def test_with_name():
+    """Test replacing the command name keeps the raw arguments"""
+    assert parse_command("lss  'a b' *.txt").with_name("ls") == "ls 'a b' *.txt"
+    assert parse_command("lss").with_name("ls") == "ls"
+
+def test_expansion(terminal, tmp_path, monkeypatch):
+    """Test ~, $VAR and glob expansion"""
+    monkeypatch.setenv("PYTERM_TEST", "value")
+    for name in ("a.txt", "b.txt", "c.log"):
+        (tmp_path / name).touch()
+
+    assert terminal.execute("echo *.txt") == "a.txt|b.txt"
+    assert terminal.execute("echo '*.txt' \"*.txt\"") == "*.txt|*.txt"
+    assert terminal.execute("echo *.none") == "*.none"
+    assert terminal.execute("echo $PYTERM_TEST \"$PYTERM_TEST\" '$PYTERM_TEST'") == "value|value|$PYTERM_TEST"
+    assert terminal.execute("echo ~ '~'") == os.path.expanduser("~") + "|~"
+
+def test_glob_in_special_directory(tmp_path):
+    """Test globbing relative to a cwd containing glob characters"""
+    cwd = tmp_path / "a[1]*"
+    (cwd / "sub").mkdir(parents=True)
+    (cwd / "sub" / "x.txt").touch()
+    term = Terminal()
+    term.register_command("echo", lambda t, *args: "|".join(args), "Echo arguments")
+    term.current_dir = str(cwd)
+    assert term.execute("echo sub/*.txt") == os.path.join("sub", "x.txt")
+    assert term.execute(f"echo '{cwd}'/sub/*.txt") == str(cwd / "sub" / "x.txt")
+
+def test_quoted_path_with_spaces(terminal, tmp_path):
+    """Test that commands receive paths containing spaces intact"""
+    assert "Directory created" in terminal.execute('mkdir "with space"')
+    assert terminal.execute("cd 'with space'") == ""
+    assert terminal.current_dir == os.path.join(str(tmp_path), "with space")
+
+def test_dir_index_persistence(tmp_path):
+    """Test that the directory index is saved and reloaded"""
+    index_path = str(tmp_path / "dirs.json")
+    term = Terminal(index_path)
+    term.change_dir(str(tmp_path))
+    term.close()
+
+    reloaded = DirIndex(index_path)
+    assert reloaded.query(tmp_path.name) == str(tmp_path)
+
+def test_dir_index_bad_file(tmp_path):
+    """Test that a wrongly shaped index file is ignored"""
+    index_path = tmp_path / "dirs.json"
+    for content in ("[]", '{"a": 1}', '{"a": [1]}', '{"a": ["x", 1]}', "not json"):
+        index_path.write_text(content)
+        assert len(DirIndex(str(index_path))) == 0
+
+def test_dir_index_save_failure(tmp_path):
+    """Test that a failing save neither breaks cd nor close"""
+    (tmp_path / "file").touch()
+    term = Terminal(str(tmp_path / "file" / "dirs.json"))
+    term.register_command("cd", cd, "Change directory")
+    term.dir_index.last_save = 0
+    assert term.execute(f"cd '{tmp_path}'") == ""
+    assert term.last_status == 0
+    assert term.dir_index.dirty
+    term.close()
+
+def test_compact_prompt():
+    """Test that long paths are abbreviated in the prompt"""
+    home = os.path.expanduser("~")
+    assert compact_path(home) == "~"
+    long_path = os.path.join(home, "workspace", "monorepo", "services", "backend", "api")
+    assert compact_path(long_path) == os.path.join("~", "w", "m", "s", "b", "api")
+
+def test_context_uses_expanded_args(terminal, tmp_path, monkeypatch):
+    """Test that natural language context refers to the expanded names"""
+    from terminal.nl_parser import parse_natural_language
+    monkeypatch.setenv("PROJ", "demo")
+    terminal.execute("mkdir $PROJ")
+    assert parse_natural_language(terminal, "go to the folder i just created") == "cd demo"
+    assert terminal.execute("cd demo") == ""
+
+def test_resolve_path_follows_retargeted_symlink(tmp_path):
+    """Test that a retargeted symlink resolves to its new target"""
+    (tmp_path / "t1").mkdir()
+    (tmp_path / "t2").mkdir()
+    link = tmp_path / "ln"
+    link.symlink_to(tmp_path / "t1")
+    assert resolve_path(str(tmp_path), "ln") == str(tmp_path / "t1")
+
+    link.unlink()
+    link.symlink_to(tmp_path / "t2")
+    assert resolve_path(str(tmp_path), "ln") == str(tmp_path / "t2")
+
+def test_dir_index_total_rank(tmp_path):
+    """Test that the running rank total follows adds, removals and aging"""
+    index = DirIndex()
+    for _ in range(3):
+        index.add(str(tmp_path))
+    index.add("/elsewhere")
+    assert index.total_rank == 4
+    index.remove("/elsewhere")
+    index.age()
+    assert index.total_rank == pytest.approx(2.7)
@@ -0,0 +1,58 @@
+import pytest
+from terminal.scrollback import Scrollback
+
+@pytest.fixture
+def scrollback():
+    """Create a small scrollback buffer for testing"""
+    return Scrollback(max_bytes=200, max_spill_bytes=1000, spill_threshold=50, preview_chars=10)
+
+def test_render_escapes_html(scrollback):
+    """Test that commands and results are HTML-escaped"""
+    scrollback.append("/tmp $ ", "cat <b>.txt", "<script>alert(1)</script>")
+    html = scrollback.render_html()
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html
+    assert "&lt;b&gt;.txt" in html
+
+def test_render_splits_parsed_command(scrollback):
+    """Test that the command name is split off like the terminal parses it"""
+    scrollback.append("$ ", "  ls   'my dir'")
+    scrollback.append("$ ", "echo 'oops")
+    html = scrollback.render_html().replace("&#x27;", "'")
+    assert "<span class='terminal-command'>ls</span> <span class='terminal-path'>'my dir'</span>" in html
+    assert "<span class='terminal-command'>echo 'oops</span>" in html
+
+def test_large_result_is_spilled(scrollback):
+    """Test that large results are kept on disk and paged in on demand"""
+    result = "x" * 500
+    entry = scrollback.append("/tmp $ ", "ls", result)
+    assert entry.spilled
+    assert len(entry.result) == 10
+    assert scrollback.read_result(entry) == result
+    assert "490 more bytes" in scrollback.render_html()
+
+def test_eviction_respects_caps(scrollback):
+    """Test that the oldest entries are evicted once caps are exceeded"""
+    for i in range(50):
+        scrollback.append("/tmp $ ", f"echo {i}", "y" * 40)
+    assert scrollback.memory_bytes <= scrollback.max_bytes
+    assert scrollback.entries[-1].command == "echo 49"
+    assert scrollback.entries[0].command != "echo 0"
+
+    for i in range(20):
+        entry = scrollback.append("/tmp $ ", f"big {i}", str(i) * 300)
+    assert scrollback.spill_bytes <= scrollback.max_spill_bytes
+    assert scrollback.read_result(entry) == "19" * 300
+
+def test_memory_counted_in_bytes(scrollback):
+    """Test that non-ASCII output is accounted for in UTF-8 bytes"""
+    entry = scrollback.append("$ ", "cat", "é" * 20)
+    assert entry.size() == 2 + 3 + 40
+    assert scrollback.memory_bytes == 45
+
+def test_window_returns_recent_entries(scrollback):
+    """Test that only the visible window is rendered"""
+    for i in range(5):
+        scrollback.append("$ ", f"cmd{i}")
+    assert [e.command for e in scrollback.window(2)] == ["cmd3", "cmd4"]
+    assert "cmd0" not in scrollback.render_html(2)